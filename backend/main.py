@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -10,7 +11,7 @@ import logging
 # Import our existing services
 from services.astra_service import AstraService
 from services.langflow_service import LangflowService
-from services.lookalike_service import LookalikeService
+from services.lookalike_service import LookalikeService, shutdown_search_executor
 from services.sentiment_service import SentimentService
 
 # Load environment variables
@@ -51,46 +52,45 @@ class ApiResponse(BaseModel):
     error: Optional[str] = None
     message: Optional[str] = None
 
-# Service instances
-astra_service = None
-langflow_service = None
-lookalike_service = None
-sentiment_service = None
+# Registry handed to endpoints, built once at startup
+service_registry: Dict[str, Any] = {}
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
-    global astra_service, langflow_service, lookalike_service, sentiment_service
-    
     try:
         # Get environment variables
         astra_token = os.getenv('ASTRA_DB_TOKEN')
         astra_endpoint = os.getenv('ASTRA_DB_ENDPOINT')
         langflow_api_key = os.getenv('LANGFLOW_API_KEY')
         langflow_flow_url = os.getenv('LANGFLOW_FLOW_URL')
+        langflow_max_concurrency = int(os.getenv('LANGFLOW_MAX_CONCURRENCY', '4'))
         
         if not all([astra_token, astra_endpoint, langflow_api_key, langflow_flow_url]):
             raise ValueError("Missing required environment variables")
         
         # Initialize services
-        astra_service = AstraService(astra_token, astra_endpoint)
-        langflow_service = LangflowService(langflow_api_key, langflow_flow_url)
-        lookalike_service = LookalikeService()
-        sentiment_service = SentimentService()
+        service_registry.update({
+            "astra": AstraService(astra_token, astra_endpoint),
+            "langflow": LangflowService(langflow_api_key, langflow_flow_url, langflow_max_concurrency),
+            "lookalike": LookalikeService(),
+            "sentiment": SentimentService()
+        })
         
         logger.info("All services initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize services: {e}")
+    except Exception:
+        logger.exception("Failed to initialize services")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release background workers on shutdown"""
+    shutdown_search_executor()
+    logger.info("Background workers stopped")
+
 def get_services():
     """Dependency to get service instances"""
-    return {
-        "astra": astra_service,
-        "langflow": langflow_service,
-        "lookalike": lookalike_service,
-        "sentiment": sentiment_service
-    }
+    return service_registry
 
 @app.get("/")
 async def root():
@@ -98,11 +98,11 @@ async def root():
     return {"message": "Company Research API is running", "status": "healthy"}
 
 @app.get("/api/health")
-async def health_check():
+async def health_check(services: Dict = Depends(get_services)):
     """Detailed health check"""
     try:
         # Test database connection
-        stats = astra_service.get_collection_stats()
+        stats = await run_in_threadpool(services["astra"].get_collection_stats)
         return ApiResponse(
             success=True,
             data={
@@ -118,9 +118,16 @@ async def health_check():
             message="Health check failed"
         )
 
+def store_research_data(astra: AstraService, company_key: str, company_data: Dict[str, Any]):
+    """Persist research results, logging rather than failing on errors"""
+    store_success = astra.store_company_data(company_key, company_data)
+    if not store_success:
+        logger.warning("Failed to store data for %s", company_key)
+
 @app.post("/api/research", response_model=ApiResponse)
 async def research_company(
     request: CompanyResearchRequest,
+    background_tasks: BackgroundTasks,
     services: Dict = Depends(get_services)
 ):
     """Research a company and return comprehensive data"""
@@ -133,9 +140,11 @@ async def research_company(
         
         # Check for existing data first
         if not request.force_refresh:
-            existing_data = astra.get_company_data(company_key, request.data_freshness_days)
+            existing_data = await run_in_threadpool(
+                astra.get_company_data, company_key, request.data_freshness_days
+            )
             if existing_data:
-                logger.info(f"Returning cached data for {company_key}")
+                logger.info("Returning cached data for %s", company_key)
                 return ApiResponse(
                     success=True,
                     data={
@@ -146,13 +155,14 @@ async def research_company(
                 )
         
         # Trigger research flow
-        flow_response = langflow.trigger_research(
+        flow_response = await run_in_threadpool(
+            langflow.trigger_research,
             request.company_name, 
             request.domain_name, 
             use_fallback=True
         )
         
-        logger.info(f"Langflow response structure: {flow_response}")
+        logger.debug("Langflow response structure: %s", flow_response)
         
         if not flow_response.get('success'):
             raise HTTPException(
@@ -184,29 +194,27 @@ async def research_company(
                 company_data = response_data
             else:
                 # Fallback: use the entire response
-                logger.warning(f"Unknown response structure, using entire response: {response_data}")
+                logger.warning("Unknown response structure, using entire response: %s", response_data)
                 company_data = response_data
                 
         except KeyError as e:
-            logger.error(f"Missing key in flow_response: {e}. Response: {flow_response}")
+            logger.error("Missing key in flow_response: %s. Response: %s", e, flow_response)
             raise HTTPException(
                 status_code=500,
                 detail=f"Invalid response structure from research flow: missing {str(e)}"
             )
         except Exception as e:
-            logger.error(f"Error parsing flow response: {e}. Response: {flow_response}")
+            logger.error("Error parsing flow response: %s. Response: %s", e, flow_response)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to parse research flow response: {str(e)}"
             )
         
         if is_fallback:
-            logger.warning(f"Using mock data for {company_key}: {flow_response.get('fallback_reason')}")
+            logger.warning("Using mock data for %s: %s", company_key, flow_response.get('fallback_reason'))
         
-        # Store data in database
-        store_success = astra.store_company_data(company_key, company_data)
-        if not store_success:
-            logger.warning(f"Failed to store data for {company_key}")
+        # Store data in database once the response has been sent
+        background_tasks.add_task(store_research_data, astra, company_key, company_data)
         
         return ApiResponse(
             success=True,
@@ -221,7 +229,7 @@ async def research_company(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Research failed for {request.company_name}: {e}")
+        logger.exception("Research failed for %s", request.company_name)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/lookalike", response_model=ApiResponse)
@@ -234,7 +242,7 @@ async def find_lookalike_companies(
         lookalike = services["lookalike"]
         
         # Find similar companies
-        results = lookalike.find_lookalike_companies(request.company_data)
+        results = await run_in_threadpool(lookalike.find_lookalike_companies, request.company_data)
         
         return ApiResponse(
             success=True,
@@ -242,7 +250,7 @@ async def find_lookalike_companies(
         )
         
     except Exception as e:
-        logger.error(f"Lookalike search failed: {e}")
+        logger.exception("Lookalike search failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/stats")
@@ -250,7 +258,7 @@ async def get_stats(services: Dict = Depends(get_services)):
     """Get platform statistics"""
     try:
         astra = services["astra"]
-        stats = astra.get_collection_stats()
+        stats = await run_in_threadpool(astra.get_collection_stats)
         
         return ApiResponse(
             success=True,
@@ -260,7 +268,7 @@ async def get_stats(services: Dict = Depends(get_services)):
             }
         )
     except Exception as e:
-        logger.error(f"Failed to get stats: {e}")
+        logger.exception("Failed to get stats")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/sentiment", response_model=ApiResponse)
@@ -280,7 +288,7 @@ async def analyze_sentiment(
         )
         
     except Exception as e:
-        logger.error(f"Sentiment analysis failed: {e}")
+        logger.exception("Sentiment analysis failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
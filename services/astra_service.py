@@ -5,6 +5,7 @@ except ImportError:
     from astrapy.db import AstraDB as DataAPIClient
     
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
 from typing import Optional, Dict, Any, List
 
@@ -44,10 +45,10 @@ class AstraService:
                 self.collection = self.db.collection("company")
                 collection_names = [collection_name]  # Assume collection exists
             
-            logger.info(f"Connected to AstraDB: {collection_names}")
+            logger.info("Connected to AstraDB: %s", collection_names)
             
-        except Exception as e:
-            logger.error(f"Failed to connect to AstraDB: {str(e)}")
+        except Exception:
+            logger.exception("Failed to connect to AstraDB")
             raise
     
     def get_company_data(self, company_key: str, freshness_days: int = 360) -> Optional[Dict[str, Any]]:
@@ -64,14 +65,12 @@ class AstraService:
         try:
             # Calculate freshness threshold
             threshold_date = datetime.now() - timedelta(days=freshness_days)
-            # Try multiple search strategies (compatible with older AstraPy)
+            # Try multiple search strategies (compatible with older AstraPy).
+            # Case variations of a name are fetched in a single $in query
+            # instead of one round trip per variation.
             search_queries = [
-                # Exact match on company_name in metadata
-                {"metadata.company_name": company_key},
-                # Try with different case variations
-                {"metadata.company_name": company_key.title()},
-                {"metadata.company_name": company_key.lower()},
-                {"metadata.company_name": company_key.upper()},
+                # Exact match on company_name in metadata, with case variations
+                {"metadata.company_name": {"$in": self._name_variations(company_key)}},
                 # Search by domain if present
                 {"metadata.domain_name": company_key.split(' - ')[-1] if ' - ' in company_key else company_key}
             ]
@@ -79,21 +78,19 @@ class AstraService:
             # Add company name only variations (for cases like "tesla - tesla.com" -> "Tesla")
             if ' - ' in company_key:
                 company_name_only = company_key.split(' - ')[0].strip()
-                search_queries.extend([
-                    {"metadata.company_name": company_name_only},
-                    {"metadata.company_name": company_name_only.title()},
-                    {"metadata.company_name": company_name_only.lower()},
-                    {"metadata.company_name": company_name_only.upper()}
-                ])
+                search_queries.append(
+                    {"metadata.company_name": {"$in": self._name_variations(company_name_only)}}
+                )
             
             for i, query in enumerate(search_queries):
                 try:
-                    logger.info(f"Trying search strategy {i+1} for: {company_key}")
+                    logger.info("Trying search strategy %d for: %s", i + 1, company_key)
                     
                     # Find documents matching the query (older astrapy version)
                     try:
                         result = self.collection.find(filter=query)
-                        logger.info(f"Find result type: {type(result)}, content: {result}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Find result type: %s, content: %s", type(result), result)
                         
                         # Handle different response formats from older astrapy
                         documents = []
@@ -108,10 +105,10 @@ class AstraService:
                         elif isinstance(result, list):
                             documents = result
                         
-                        logger.info(f"Processed documents: {len(documents)} found")
+                        logger.info("Processed documents: %d found", len(documents))
                         
-                    except Exception as find_error:
-                        logger.error(f"Find error: {find_error}")
+                    except Exception:
+                        logger.exception("Find error")
                         documents = []
                     
                     if documents:
@@ -120,23 +117,36 @@ class AstraService:
                         
                         # Check data freshness
                         if self._is_data_fresh(best_document, threshold_date):
-                            logger.info(f"Found fresh data for {company_key}")
+                            logger.info("Found fresh data for %s", company_key)
                             return best_document
                         else:
-                            logger.info(f"Found stale data for {company_key}")
+                            logger.info("Found stale data for %s", company_key)
                             return None
                     
                 except Exception as search_error:
-                    logger.warning(f"Search strategy {i+1} failed: {str(search_error)}")
+                    logger.warning("Search strategy %d failed: %s", i + 1, search_error)
                     continue
             
-            logger.info(f"No data found for {company_key}")
+            logger.info("No data found for %s", company_key)
             return None
             
-        except Exception as e:
-            logger.error(f"Error querying AstraDB: {str(e)}")
+        except Exception:
+            logger.exception("Error querying AstraDB")
             return None
     
+    @staticmethod
+    def _name_variations(name: str) -> List[str]:
+        """
+        Build the distinct case variations of a company name to search for
+        
+        Args:
+            name: Company name or key as provided
+            
+        Returns:
+            Unique variations in priority order
+        """
+        return list(dict.fromkeys([name, name.title(), name.lower(), name.upper()]))
+    
     def _is_data_fresh(self, document: Dict[str, Any], threshold_date: datetime) -> bool:
         """
         Check if document data is fresh based on timestamp
@@ -162,18 +172,23 @@ class AstraService:
                 return False
             
             is_fresh = document_date > threshold_date
-            logger.info(f"Data freshness check: {document_date} > {threshold_date} = {is_fresh}")
+            logger.info("Data freshness check: %s > %s = %s", document_date, threshold_date, is_fresh)
             
             return is_fresh
             
-        except Exception as e:
-            logger.error(f"Error checking data freshness: {str(e)}")
+        except Exception:
+            logger.exception("Error checking data freshness")
             return False
     
-    def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_timestamp(timestamp_str: str) -> Optional[datetime]:
         """
         Parse timestamp string with multiple format support
         
+        Results are cached per string, since the same document timestamps
+        are parsed on every lookup and scoring pass.
+        
         Args:
             timestamp_str: Timestamp string to parse
             
@@ -201,7 +216,7 @@ class AstraService:
             else:
                 return datetime.fromisoformat(timestamp_str)
         except Exception as e:
-            logger.error(f"Failed to parse timestamp '{timestamp_str}': {e}")
+            logger.error("Failed to parse timestamp '%s': %s", timestamp_str, e)
             return None
     
     def _select_best_document(self, documents: List[Dict], company_key: str) -> Dict:
@@ -221,7 +236,11 @@ class AstraService:
         if len(documents) == 1:
             return documents[0]
         
-        logger.info(f"Selecting best from {len(documents)} documents for key: {company_key}")
+        logger.info("Selecting best from %d documents for key: %s", len(documents), company_key)
+        
+        # Capture per-batch values once instead of per document
+        now = datetime.now()
+        company_key_lower = company_key.lower()
         
         # Score each document
         scored_docs = []
@@ -231,9 +250,9 @@ class AstraService:
             
             # 1. Exact company name match (highest priority)
             stored_name = metadata.get('company_name', '').lower()
-            if stored_name == company_key.lower():
+            if stored_name == company_key_lower:
                 score += 100
-                logger.info(f"Exact match bonus for: {stored_name}")
+                logger.info("Exact match bonus for: %s", stored_name)
             
             # 2. Recency score (up to 50 points)
             timestamp_str = metadata.get('timestamp', '')
@@ -241,11 +260,11 @@ class AstraService:
                 try:
                     doc_time = self._parse_timestamp(timestamp_str)
                     if doc_time:
-                        hours_old = (datetime.now() - doc_time).total_seconds() / 3600
+                        hours_old = (now - doc_time).total_seconds() / 3600
                         # More recent = higher score (max 50 points for data < 1 hour old)
                         recency_score = max(0, 50 - hours_old)
                         score += recency_score
-                        logger.info(f"Recency score: {recency_score:.1f} (age: {hours_old:.1f}h)")
+                        logger.info("Recency score: %.1f (age: %.1fh)", recency_score, hours_old)
                 except:
                     pass
             
@@ -271,17 +290,15 @@ class AstraService:
                 richness_score += min(15, len(sources) * 3)
             
             score += richness_score
-            logger.info(f"Richness score: {richness_score}")
+            logger.info("Richness score: %s", richness_score)
             
             scored_docs.append((score, doc))
-            logger.info(f"Total score: {score} for doc {doc.get('_id', 'unknown')}")
+            logger.info("Total score: %s for doc %s", score, doc.get('_id', 'unknown'))
         
-        # Sort by score (highest first) and return best
-        scored_docs.sort(key=lambda x: x[0], reverse=True)
-        best_doc = scored_docs[0][1]
-        best_score = scored_docs[0][0]
+        # Pick the highest score (first one wins on ties)
+        best_score, best_doc = max(scored_docs, key=lambda x: x[0])
         
-        logger.info(f"Selected best document with score: {best_score}")
+        logger.info("Selected best document with score: %s", best_score)
         return best_doc
     
     def store_company_data(self, company_key: str, research_data: Dict[str, Any]) -> bool:
@@ -320,14 +337,14 @@ class AstraService:
                 success = result
             
             if success:
-                logger.info(f"Successfully stored data for {company_key}")
+                logger.info("Successfully stored data for %s", company_key)
                 return True
             else:
-                logger.error(f"Failed to store data for {company_key}")
+                logger.error("Failed to store data for %s", company_key)
                 return False
                 
-        except Exception as e:
-            logger.error(f"Error storing company data: {str(e)}")
+        except Exception:
+            logger.exception("Error storing company data")
             return False
     
     def get_collection_stats(self) -> Dict[str, Any]:
@@ -341,13 +358,14 @@ class AstraService:
             # Get estimated document count (older astrapy version)
             try:
                 # Try to get a sample of documents to estimate count
-                sample_docs = self.collection.find(filter={})
+                # (only ids are needed to count them)
+                sample_docs = self.collection.find(filter={}, projection={"_id": 1})
                 if isinstance(sample_docs, list):
                     count_result = f"~{len(sample_docs)}" if len(sample_docs) < 100 else "100+"
                 else:
                     count_result = "Available"
-            except Exception as e:
-                logger.error(f"Stats error: {e}")
+            except Exception:
+                logger.exception("Stats error")
                 count_result = "Unknown"
             
             return {
@@ -356,8 +374,8 @@ class AstraService:
                 "status": "connected"
             }
             
-        except Exception as e:
-            logger.error(f"Error getting collection stats: {str(e)}")
+        except Exception:
+            logger.exception("Error getting collection stats")
             return {
                 "document_count": "Error",
                 "collection_name": self.collection_name,
@@ -379,6 +397,11 @@ class AstraService:
             # Use vector search to find similar companies
             cursor = self.collection.find(
                 {},
+                projection={
+                    "metadata.company_name": 1,
+                    "metadata.industry": 1,
+                    "metadata.revenue": 1
+                },
                 sort={"$vectorize": company_name},
                 limit=limit
             )
@@ -395,8 +418,8 @@ class AstraService:
             
             return results
             
-        except Exception as e:
-            logger.error(f"Error searching similar companies: {str(e)}")
+        except Exception:
+            logger.exception("Error searching similar companies")
             return []
     
     def delete_company_data(self, company_key: str) -> bool:
@@ -413,12 +436,12 @@ class AstraService:
             result = self.collection.delete_many({"metadata.company_name": company_key})
             
             if result.deleted_count > 0:
-                logger.info(f"Deleted {result.deleted_count} documents for {company_key}")
+                logger.info("Deleted %d documents for %s", result.deleted_count, company_key)
                 return True
             else:
-                logger.warning(f"No documents found to delete for {company_key}")
+                logger.warning("No documents found to delete for %s", company_key)
                 return False
                 
-        except Exception as e:
-            logger.error(f"Error deleting company data: {str(e)}")
+        except Exception:
+            logger.exception("Error deleting company data")
             return False
@@ -1,11 +1,75 @@
 import requests
 import logging
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import json
 
 logger = logging.getLogger(__name__)
 
+# Patterns used to clean up company names from search result titles
+NAME_CLEANUP_PATTERNS = (
+    re.compile(r'\s*\([^)]*\)'),  # Remove parentheses
+    re.compile(r'\s*-.*$'),        # Remove everything after dash
+    re.compile(r'\s*\|.*$'),       # Remove everything after pipe
+)
+
+# Patterns used to extract financial figures from company snippets
+REVENUE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\$(\d+(?:\.\d+)?)\s*billion',
+    r'\$(\d+(?:\.\d+)?)\s*B',
+    r'revenue.*?\$(\d+(?:\.\d+)?)\s*billion',
+    r'sales.*?\$(\d+(?:\.\d+)?)\s*billion'
+))
+
+MARKET_CAP_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'market cap.*?\$(\d+(?:\.\d+)?)\s*billion',
+    r'valued at.*?\$(\d+(?:\.\d+)?)\s*billion',
+    r'worth.*?\$(\d+(?:\.\d+)?)\s*billion'
+))
+
+EMPLOYEE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(\d+,?\d*)\s*employees',
+    r'workforce of (\d+,?\d*)',
+    r'employs (\d+,?\d*)'
+))
+
+# Known major companies with approximate data
+KNOWN_COMPANIES = {
+    'nvidia': {'revenue': '$60.9B', 'market_cap': '$1.8T', 'industry': 'Semiconductors'},
+    'rivian': {'revenue': '$4.4B', 'market_cap': '$15.2B', 'industry': 'Electric Vehicles'},
+    'lucid': {'revenue': '$0.6B', 'market_cap': '$8.1B', 'industry': 'Electric Vehicles'},
+    'nio': {'revenue': '$7.0B', 'market_cap': '$9.8B', 'industry': 'Electric Vehicles'},
+    'byd': {'revenue': '$70.2B', 'market_cap': '$95.4B', 'industry': 'Electric Vehicles'},
+    'ford': {'revenue': '$176.2B', 'market_cap': '$48.5B', 'industry': 'Automotive'},
+    'gm': {'revenue': '$171.8B', 'market_cap': '$54.2B', 'industry': 'Automotive'},
+    'volkswagen': {'revenue': '$279.2B', 'market_cap': '$58.9B', 'industry': 'Automotive'},
+    'toyota': {'revenue': '$274.5B', 'market_cap': '$245.1B', 'industry': 'Automotive'},
+}
+
+# Industry patterns and typical ranges used for estimation
+INDUSTRY_PATTERNS = {
+    'electric vehicle': {
+        'industry': 'Electric Vehicles',
+        'revenue_range': (0.5, 15.0),  # Billions
+        'market_cap_multiplier': 3.0
+    },
+    'automotive': {
+        'industry': 'Automotive',
+        'revenue_range': (10.0, 200.0),
+        'market_cap_multiplier': 0.8
+    },
+    'semiconductor': {
+        'industry': 'Semiconductors',
+        'revenue_range': (1.0, 80.0),
+        'market_cap_multiplier': 8.0
+    },
+    'software': {
+        'industry': 'Software',
+        'revenue_range': (0.1, 50.0),
+        'market_cap_multiplier': 12.0
+    }
+}
+
 class FinancialEnrichmentService:
     """
     Service to enrich company data with financial information
@@ -29,14 +93,17 @@ class FinancialEnrichmentService:
             List of companies enriched with financial data
         """
         enriched_companies = []
+        failed_companies = []
         
         for company in companies:
             try:
                 # Extract company name from title or name field
                 company_name = self._extract_company_name(company)
                 
-                # Get financial data
-                financial_data = self._get_financial_data(company_name, company.get('snippet', ''))
+                # Get financial data (partial data is still used when a strategy fails)
+                financial_data, complete = self._get_financial_data(company_name, company.get('snippet', ''))
+                if not complete:
+                    failed_companies.append(company_name)
                 
                 # Add financial data to company
                 enriched_company = company.copy()
@@ -45,9 +112,18 @@ class FinancialEnrichmentService:
                 enriched_companies.append(enriched_company)
                 
             except Exception as e:
-                logger.warning(f"Failed to enrich {company.get('name', 'Unknown')}: {str(e)}")
+                company_name = str(company.get('name', 'Unknown'))
+                logger.debug("Failed to enrich %s: %s", company_name, e)
+                failed_companies.append(company_name)
                 enriched_companies.append(company)
         
+        # Report failures once per batch rather than once per company
+        if failed_companies:
+            logger.warning(
+                "Failed to enrich %d of %d companies: %s",
+                len(failed_companies), len(companies), ", ".join(failed_companies)
+            )
+        
         return enriched_companies
     
     def _extract_company_name(self, company: Dict[str, Any]) -> str:
@@ -56,9 +132,8 @@ class FinancialEnrichmentService:
         name = company.get('name') or company.get('title', '')
         
         # Clean up the name
-        name = re.sub(r'\s*\([^)]*\)', '', name)  # Remove parentheses
-        name = re.sub(r'\s*-.*$', '', name)       # Remove everything after dash
-        name = re.sub(r'\s*\|.*$', '', name)      # Remove everything after pipe
+        for pattern in NAME_CLEANUP_PATTERNS:
+            name = pattern.sub('', name)
         name = name.strip()
         
         # Extract first few words if it's a long title
@@ -68,7 +143,7 @@ class FinancialEnrichmentService:
         
         return name
     
-    def _get_financial_data(self, company_name: str, snippet: str) -> Dict[str, Any]:
+    def _get_financial_data(self, company_name: str, snippet: str) -> Tuple[Dict[str, Any], bool]:
         """
         Get financial data for a company using multiple strategies
         
@@ -77,7 +152,8 @@ class FinancialEnrichmentService:
             snippet: Company description/snippet
             
         Returns:
-            Dictionary with financial data
+            Tuple of the financial data gathered and whether every strategy
+            ran without error
         """
         financial_data = {
             'revenue': None,
@@ -102,53 +178,33 @@ class FinancialEnrichmentService:
             if not financial_data['revenue'] and industry_data:
                 financial_data.update(industry_data)
                 
-        except Exception as e:
-            logger.warning(f"Error getting financial data for {company_name}: {str(e)}")
+        except Exception:
+            # The caller reports failures once per batch
+            logger.debug("Error getting financial data for %s", company_name, exc_info=True)
+            return financial_data, False
         
-        return financial_data
+        return financial_data, True
     
     def _extract_from_snippet(self, snippet: str) -> Dict[str, Any]:
         """Extract financial data from company snippet/description"""
         data = {}
         
-        # Revenue patterns
-        revenue_patterns = [
-            r'\$(\d+(?:\.\d+)?)\s*billion',
-            r'\$(\d+(?:\.\d+)?)\s*B',
-            r'revenue.*?\$(\d+(?:\.\d+)?)\s*billion',
-            r'sales.*?\$(\d+(?:\.\d+)?)\s*billion'
-        ]
-        
-        for pattern in revenue_patterns:
-            match = re.search(pattern, snippet, re.IGNORECASE)
+        for pattern in REVENUE_PATTERNS:
+            match = pattern.search(snippet)
             if match:
                 revenue_billions = float(match.group(1))
                 data['revenue'] = f"${revenue_billions:.1f}B"
                 break
         
-        # Market cap patterns
-        market_cap_patterns = [
-            r'market cap.*?\$(\d+(?:\.\d+)?)\s*billion',
-            r'valued at.*?\$(\d+(?:\.\d+)?)\s*billion',
-            r'worth.*?\$(\d+(?:\.\d+)?)\s*billion'
-        ]
-        
-        for pattern in market_cap_patterns:
-            match = re.search(pattern, snippet, re.IGNORECASE)
+        for pattern in MARKET_CAP_PATTERNS:
+            match = pattern.search(snippet)
             if match:
                 cap_billions = float(match.group(1))
                 data['market_cap'] = f"${cap_billions:.1f}B"
                 break
         
-        # Employee patterns
-        employee_patterns = [
-            r'(\d+,?\d*)\s*employees',
-            r'workforce of (\d+,?\d*)',
-            r'employs (\d+,?\d*)'
-        ]
-        
-        for pattern in employee_patterns:
-            match = re.search(pattern, snippet, re.IGNORECASE)
+        for pattern in EMPLOYEE_PATTERNS:
+            match = pattern.search(snippet)
             if match:
                 employees = match.group(1).replace(',', '')
                 data['employees'] = f"{int(employees):,}"
@@ -158,22 +214,8 @@ class FinancialEnrichmentService:
     
     def _get_from_patterns(self, company_name: str) -> Optional[Dict[str, Any]]:
         """Get financial data based on known company patterns"""
-        
-        # Known major companies with approximate data
-        known_companies = {
-            'nvidia': {'revenue': '$60.9B', 'market_cap': '$1.8T', 'industry': 'Semiconductors'},
-            'rivian': {'revenue': '$4.4B', 'market_cap': '$15.2B', 'industry': 'Electric Vehicles'},
-            'lucid': {'revenue': '$0.6B', 'market_cap': '$8.1B', 'industry': 'Electric Vehicles'},
-            'nio': {'revenue': '$7.0B', 'market_cap': '$9.8B', 'industry': 'Electric Vehicles'},
-            'byd': {'revenue': '$70.2B', 'market_cap': '$95.4B', 'industry': 'Electric Vehicles'},
-            'ford': {'revenue': '$176.2B', 'market_cap': '$48.5B', 'industry': 'Automotive'},
-            'gm': {'revenue': '$171.8B', 'market_cap': '$54.2B', 'industry': 'Automotive'},
-            'volkswagen': {'revenue': '$279.2B', 'market_cap': '$58.9B', 'industry': 'Automotive'},
-            'toyota': {'revenue': '$274.5B', 'market_cap': '$245.1B', 'industry': 'Automotive'},
-        }
-        
         company_lower = company_name.lower()
-        for key, data in known_companies.items():
+        for key, data in KNOWN_COMPANIES.items():
             if key in company_lower or company_lower in key:
                 return data
         
@@ -181,34 +223,9 @@ class FinancialEnrichmentService:
     
     def _estimate_by_industry(self, company_name: str, snippet: str) -> Optional[Dict[str, Any]]:
         """Estimate financial data based on industry and company indicators"""
-        
-        # Industry patterns and typical ranges
-        industry_patterns = {
-            'electric vehicle': {
-                'industry': 'Electric Vehicles',
-                'revenue_range': (0.5, 15.0),  # Billions
-                'market_cap_multiplier': 3.0
-            },
-            'automotive': {
-                'industry': 'Automotive',
-                'revenue_range': (10.0, 200.0),
-                'market_cap_multiplier': 0.8
-            },
-            'semiconductor': {
-                'industry': 'Semiconductors',
-                'revenue_range': (1.0, 80.0),
-                'market_cap_multiplier': 8.0
-            },
-            'software': {
-                'industry': 'Software',
-                'revenue_range': (0.1, 50.0),
-                'market_cap_multiplier': 12.0
-            }
-        }
-        
         text = f"{company_name} {snippet}".lower()
         
-        for pattern, data in industry_patterns.items():
+        for pattern, data in INDUSTRY_PATTERNS.items():
             if pattern in text:
                 # Estimate based on company size indicators
                 if 'startup' in text or 'founded 20' in text:
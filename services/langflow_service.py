@@ -1,24 +1,55 @@
 import requests
 import logging
+import threading
 import time
-from typing import Dict, Any
+import zlib
+from typing import Dict, Any, Optional
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    # Fallback to the standard library when orjson is not installed
+    import json
+
+    def _dumps(payload: Dict[str, Any]) -> bytes:
+        return json.dumps(payload).encode("utf-8")
+
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+OVERLOADED_SUGGESTION = "The Langflow API is overloaded. Please try again in a few minutes."
+
 class LangflowService:
     """Service class for Langflow API operations"""
     
-    def __init__(self, api_key: str, flow_url: str):
+    def __init__(self, api_key: str, flow_url: str, max_concurrent_requests: int = 4,
+                 queue_timeout: float = 30):
         """
         Initialize Langflow service
         
         Args:
             api_key: Langflow API key
             flow_url: Complete URL for the Langflow API endpoint
+            max_concurrent_requests: Maximum research flows in flight at once
+            queue_timeout: Seconds to wait for a free slot before reporting overload
         """
+        if max_concurrent_requests < 1:
+            raise ValueError(
+                f"max_concurrent_requests must be at least 1, got {max_concurrent_requests}"
+            )
+        
         self.api_key = api_key
         self.flow_url = flow_url
         
+        # Bound concurrent research flows; callers wait at most queue_timeout
+        # for a slot so bursts are rejected instead of piling up
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        self.queue_timeout = queue_timeout
+        
         # Request headers
         self.headers = {
             "Content-Type": "application/json",
@@ -53,23 +84,37 @@ class LangflowService:
                 }
             }
             
-            logger.info(f"Triggering Langflow research for {company_name} - {domain_name}")
+            logger.info("Triggering Langflow research for %s - %s", company_name, domain_name)
             
             # Retry mechanism for API calls with exponential backoff
             max_retries = 2  # Reduced retries to fail faster for unknown companies
             base_retry_delay = 10  # Base delay in seconds
             
+            # Serialize once, reused across retries
+            body = _dumps(payload)
+            
             for attempt in range(max_retries):
                 try:
-                    logger.info(f"Attempt {attempt + 1}/{max_retries} for {company_name}")
+                    logger.info("Attempt %d/%d for %s", attempt + 1, max_retries, company_name)
+                    
+                    # Wait a bounded time for a free slot rather than queueing indefinitely
+                    if not self._request_slots.acquire(timeout=self.queue_timeout):
+                        return self._error_response(
+                            f"Langflow API is at capacity, no slot freed within {self.queue_timeout}s for {company_name}",
+                            "capacity_exceeded",
+                            suggestion=OVERLOADED_SUGGESTION
+                        )
                     
                     # Make API request with longer timeout
-                    response = requests.post(
-                        self.flow_url,
-                        json=payload,
-                        headers=self.headers,
-                        timeout=60  # 1 minute timeout for research flows
-                    )
+                    try:
+                        response = requests.post(
+                            self.flow_url,
+                            data=body,
+                            headers=self.headers,
+                            timeout=60  # 1 minute timeout for research flows
+                        )
+                    finally:
+                        self._request_slots.release()
                     
                     # If successful, break out of retry loop
                     response.raise_for_status()
@@ -78,18 +123,15 @@ class LangflowService:
                 except requests.exceptions.Timeout:
                     retry_delay = base_retry_delay * (2 ** attempt)  # Exponential backoff
                     if attempt < max_retries - 1:
-                        logger.warning(f"Timeout on attempt {attempt + 1}, retrying in {retry_delay}s...")
+                        logger.warning("Timeout on attempt %d, retrying in %ss...", attempt + 1, retry_delay)
                         time.sleep(retry_delay)
                         continue
                     else:
-                        error_msg = f"Langflow API timed out after {max_retries} attempts for {company_name}"
-                        logger.error(error_msg)
-                        return {
-                            "success": False,
-                            "error": error_msg,
-                            "error_type": "timeout_exhausted",
-                            "suggestion": "The Langflow API is overloaded. Please try again in a few minutes."
-                        }
+                        return self._error_response(
+                            f"Langflow API timed out after {max_retries} attempts for {company_name}",
+                            "timeout_exhausted",
+                            suggestion=OVERLOADED_SUGGESTION
+                        )
                         
                 except requests.exceptions.RequestException as e:
                     retry_delay = base_retry_delay * (2 ** attempt)  # Exponential backoff
@@ -102,7 +144,8 @@ class LangflowService:
                     
                     if should_retry:
                         status_code = e.response.status_code if hasattr(e, 'response') and e.response else 'N/A'
-                        logger.warning(f"API error (status: {status_code}) on attempt {attempt + 1}, retrying in {retry_delay}s...")
+                        logger.warning("API error (status: %s) on attempt %d, retrying in %ss...",
+                                       status_code, attempt + 1, retry_delay)
                         time.sleep(retry_delay)
                         continue
                     else:
@@ -111,10 +154,11 @@ class LangflowService:
             # Check response status
             response.raise_for_status()
             
-            # Parse response
-            response_data = response.json()
+            # Parse response (an invalid JSON body raises ValueError and is
+            # reported as error_type "parse_error")
+            response_data = _loads(response.content)
             
-            logger.info(f"Langflow research triggered successfully for {company_name}")
+            logger.info("Langflow research triggered successfully for %s", company_name)
             
             return {
                 "success": True,
@@ -126,55 +170,62 @@ class LangflowService:
             
         except requests.exceptions.Timeout:
             error_msg = f"Langflow API request timed out for {company_name}"
-            logger.error(error_msg)
             
             if use_fallback:
-                logger.info(f"Using fallback data for {company_name} due to API timeout")
+                logger.error(error_msg)
+                logger.info("Using fallback data for %s due to API timeout", company_name)
                 return self._generate_fallback_response(company_name, domain_name, "timeout")
             
-            return {
-                "success": False,
-                "error": error_msg,
-                "error_type": "timeout"
-            }
+            return self._error_response(error_msg, "timeout")
             
         except requests.exceptions.HTTPError as e:
             error_msg = f"Langflow API HTTP error for {company_name}: {e.response.status_code}"
-            logger.error(f"{error_msg} - Response: {e.response.text}")
-            return {
-                "success": False,
-                "error": error_msg,
-                "error_type": "http_error",
-                "status_code": e.response.status_code,
-                "response_text": e.response.text
-            }
+            return self._error_response(
+                error_msg,
+                "http_error",
+                log_message=f"{error_msg} - Response: {e.response.text}",
+                status_code=e.response.status_code,
+                response_text=e.response.text
+            )
             
         except requests.exceptions.RequestException as e:
-            error_msg = f"Langflow API request error for {company_name}: {str(e)}"
-            logger.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "error_type": "request_error"
-            }
+            return self._error_response(
+                f"Langflow API request error for {company_name}: {str(e)}", "request_error"
+            )
             
         except ValueError as e:
-            error_msg = f"Failed to parse Langflow response for {company_name}: {str(e)}"
-            logger.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "error_type": "parse_error"
-            }
+            return self._error_response(
+                f"Failed to parse Langflow response for {company_name}: {str(e)}", "parse_error"
+            )
             
         except Exception as e:
-            error_msg = f"Unexpected error in Langflow request for {company_name}: {str(e)}"
-            logger.error(error_msg)
-            return {
-                "success": False,
-                "error": error_msg,
-                "error_type": "unexpected_error"
-            }
+            return self._error_response(
+                f"Unexpected error in Langflow request for {company_name}: {str(e)}", "unexpected_error",
+                exc_info=True
+            )
+    
+    def _error_response(self, error_msg: str, error_type: str, exc_info: bool = False,
+                        log_message: Optional[str] = None, **details: Any) -> Dict[str, Any]:
+        """
+        Log a failed research request and build its error response
+        
+        Args:
+            error_msg: Error message returned to the caller
+            error_type: Machine-readable error category
+            exc_info: Log the active exception's traceback (for unexpected errors)
+            log_message: Message to log instead of error_msg, if more detail is useful
+            **details: Extra fields to include in the response
+            
+        Returns:
+            Dictionary with failure status and error details
+        """
+        logger.error(log_message or error_msg, exc_info=exc_info)
+        return {
+            "success": False,
+            "error": error_msg,
+            "error_type": error_type,
+            **details
+        }
     
     def get_flow_status(self, flow_id: str = None) -> Dict[str, Any]:
         """
@@ -196,7 +247,7 @@ class LangflowService:
             }
             
         except Exception as e:
-            logger.error(f"Error getting flow status: {str(e)}")
+            logger.exception("Error getting flow status")
             return {
                 "success": False,
                 "error": str(e),
@@ -298,8 +349,11 @@ class LangflowService:
         from datetime import datetime
         import uuid
         
+        # One timestamp for the whole fallback response
+        timestamp = datetime.now().isoformat()
+        
         # Generate realistic mock data based on company name
-        mock_data = self._generate_mock_company_data(company_name, domain_name)
+        mock_data = self._generate_mock_company_data(company_name, domain_name, timestamp)
         
         return {
             "success": True,
@@ -308,7 +362,7 @@ class LangflowService:
             "response": {
                 "message": f"Generated mock data for {company_name} due to API unavailability",
                 "data": mock_data,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "source": "fallback_generator"
             },
             "status_code": 200,
@@ -317,13 +371,15 @@ class LangflowService:
             "note": "This is mock data generated due to Langflow API unavailability. Real data will be available when the API is restored."
         }
     
-    def _generate_mock_company_data(self, company_name: str, domain_name: str) -> Dict[str, Any]:
+    def _generate_mock_company_data(self, company_name: str, domain_name: str,
+                                    timestamp: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate realistic mock company data
         
         Args:
             company_name: Name of the company
             domain_name: Domain name of the company
+            timestamp: ISO timestamp to stamp the data with (defaults to now)
             
         Returns:
             Dictionary with mock company data
@@ -345,7 +401,8 @@ class LangflowService:
             industry = random.choice(industries)
         
         # Generate revenue based on company name hash for consistency
-        name_hash = hash(company_name) % 1000
+        # (crc32 is stable across processes, unlike the salted builtin hash)
+        name_hash = zlib.crc32(company_name.encode("utf-8")) % 1000
         revenue_base = (name_hash % 50) + 10  # 10-60B range
         revenue = f"{revenue_base}.{random.randint(1, 9)}B"
         
@@ -361,7 +418,7 @@ class LangflowService:
             "employees": employees,
             "headquarters": headquarters,
             "domain_name": domain_name,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "data_source": "fallback_mock",
             "status": "success",
             "company_info": {
@@ -8,8 +8,10 @@ industry characteristics, and business models.
 import os
 import requests
 import logging
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from .financial_enrichment_service import FinancialEnrichmentService
 from datetime import datetime
 
@@ -17,20 +19,109 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Domains whose results get an authority bonus in similarity scoring
+AUTHORITATIVE_DOMAINS = frozenset({'crunchbase.com', 'linkedin.com', 'bloomberg.com', 'forbes.com'})
+
+# Revenue scales treated as large companies
+LARGE_REVENUE_SCALES = frozenset({'large', 'enterprise'})
+
+# Expansion plan values that indicate active expansion
+EXPANDING_VALUES = frozenset({'yes', 'true', 'expanding'})
+
+# Pool for the concurrent Exa/Tavily searches, shared by every LookalikeService
+# (two searches per request, so eight workers serve four requests at once).
+# Created on first use so it can be rebuilt after a shutdown.
+_search_executor: Optional[ThreadPoolExecutor] = None
+_search_executor_lock = threading.Lock()
+
+def _get_search_executor() -> ThreadPoolExecutor:
+    """Return the shared search pool, creating it if needed"""
+    global _search_executor
+    with _search_executor_lock:
+        if _search_executor is None:
+            _search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="lookalike-search")
+        return _search_executor
+
+def shutdown_search_executor() -> None:
+    """Stop the shared search pool, cancelling searches that have not started yet"""
+    global _search_executor
+    with _search_executor_lock:
+        executor, _search_executor = _search_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# Company size implied by revenue scale when no employee count is available
+REVENUE_SCALE_TO_COMPANY_SIZE = {
+    'enterprise': 'enterprise',
+    'large': 'large',
+    'medium': 'medium'
+}
+
+class _TTLCache:
+    """Dict-backed cache whose entries expire after a fixed number of seconds
+    
+    Reads are a single dict lookup plus a monotonic clock compare and take no
+    lock. Writes are serialized and purge expired entries every purge_every
+    writes, or sooner when the cache exceeds maxsize (oldest entries go first).
+    A maxsize below 1 disables the cache: set() stores nothing.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, purge_every: int = 64):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._store: Dict[Any, Tuple[Any, float]] = {}
+        self._writes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Any:
+        """Return the cached value for key, or None if missing or expired"""
+        value, expires_at = self._store.get(key, (None, 0.0))
+        return value if expires_at > time.monotonic() else None
+    
+    def set(self, key: Any, value: Any) -> None:
+        """Store value under key, purging stale entries every purge_every writes"""
+        if self.maxsize < 1:
+            return
+        with self._lock:
+            # Re-insert so dict order stays oldest-first for size eviction
+            self._store.pop(key, None)
+            self._store[key] = (value, time.monotonic() + self.ttl)
+            self._writes += 1
+            if self._writes >= self.purge_every or len(self._store) > self.maxsize:
+                self._purge()
+    
+    def _purge(self) -> None:
+        """Drop expired entries and trim to maxsize; caller holds the lock"""
+        now = time.monotonic()
+        live = [(key, entry) for key, entry in self._store.items() if entry[1] > now]
+        # Swap in a new dict so concurrent readers never see a half-purged store
+        self._store = dict(live[-self.maxsize:])
+        self._writes = 0
+
 class LookalikeService:
     """Service for finding look-alike companies using Exa and Tavily APIs"""
     
-    def __init__(self, exa_api_key: Optional[str] = None, tavily_api_key: Optional[str] = None):
+    def __init__(self, exa_api_key: Optional[str] = None, tavily_api_key: Optional[str] = None,
+                 cache_ttl_seconds: int = 3600, cache_size: int = 256):
         """
         Initialize the LookalikeService
         
         Args:
             exa_api_key: Exa API key for web search
             tavily_api_key: Tavily API key for research
+            cache_ttl_seconds: How long search results are reused for the same characteristics
+            cache_size: Maximum number of cached searches (0 disables caching)
         """
         self.exa_api_key = exa_api_key or os.getenv('EXA_API_KEY')
         self.tavily_api_key = tavily_api_key or os.getenv('TAVILY_API_KEY')
         
+        # Report missing keys once here instead of on every search
+        if not self.exa_api_key:
+            logger.warning("Exa API key not available, Exa search disabled")
+        if not self.tavily_api_key:
+            logger.warning("Tavily API key not available, Tavily search disabled")
+        
         self.exa_base_url = "https://api.exa.ai"
         self.tavily_base_url = "https://api.tavily.com"
         
@@ -40,6 +131,9 @@ class LookalikeService:
         
         # Initialize financial enrichment service
         self.financial_service = FinancialEnrichmentService()
+        
+        # Cache of enriched search results keyed by search characteristics
+        self._results_cache = _TTLCache(maxsize=cache_size, ttl=cache_ttl_seconds)
     
     def find_lookalike_companies(self, target_company: Dict[str, Any], 
                                 num_results: int = 10) -> Dict[str, Any]:
@@ -57,44 +151,40 @@ class LookalikeService:
             # Extract key characteristics from target company
             characteristics = self._extract_company_characteristics(target_company)
             
-            # Search for similar companies using both APIs
-            exa_results = self._search_with_exa(characteristics, num_results // 2)
-            tavily_results = self._search_with_tavily(characteristics, num_results // 2)
-            
-            # Combine and rank results
-            combined_results = self._combine_and_rank_results(
-                exa_results, tavily_results, characteristics
-            )
+            # Reuse recent results for the same characteristics to skip the
+            # Exa/Tavily round trips and financial enrichment
+            cache_key = self._get_cache_key(characteristics, num_results)
+            search_results = self._results_cache.get(cache_key)
             
-            # Analyze similarity patterns
-            similarity_analysis = self._analyze_similarity_patterns(
-                target_company, combined_results
-            )
+            if search_results is None:
+                search_results, searches_ok = self._search_lookalike_companies(
+                    target_company, characteristics, num_results
+                )
+                # Only cache when every configured provider answered, so a
+                # transient failure of either one is not reused for the TTL
+                if searches_ok and search_results["lookalike_companies"]:
+                    self._results_cache.set(cache_key, search_results)
+            else:
+                logger.info("Returning cached lookalike results")
             
-            # Enrich companies with financial data
-            logger.info(f"Enriching {len(combined_results[:num_results])} companies with financial data")
-            enriched_companies = self.financial_service.enrich_companies_with_financial_data(
-                combined_results[:num_results]
-            )
+            target_metadata = target_company.get('metadata', {})
             
             return {
                 "target_company": {
-                    "name": target_company.get('metadata', {}).get('company_name', 'Unknown'),
-                    "industry": target_company.get('metadata', {}).get('company_info', {}).get('industry', 'Unknown'),
+                    "name": target_metadata.get('company_name', 'Unknown'),
+                    "industry": target_metadata.get('company_info', {}).get('industry', 'Unknown'),
                     "characteristics": characteristics
                 },
-                "lookalike_companies": enriched_companies,
-                "similarity_analysis": similarity_analysis,
+                "lookalike_companies": search_results["lookalike_companies"],
+                "similarity_analysis": search_results["similarity_analysis"],
                 "search_metadata": {
                     "timestamp": datetime.now().isoformat(),
-                    "exa_results_count": len(exa_results),
-                    "tavily_results_count": len(tavily_results),
-                    "total_candidates": len(combined_results)
+                    **search_results["counts"]
                 }
             }
             
         except Exception as e:
-            logger.error(f"Error finding lookalike companies: {str(e)}")
+            logger.exception("Error finding lookalike companies")
             return {
                 "target_company": {"name": "Unknown", "industry": "Unknown"},
                 "lookalike_companies": [],
@@ -102,6 +192,75 @@ class LookalikeService:
                 "search_metadata": {"error": str(e)}
             }
     
+    def _search_lookalike_companies(self, target_company: Dict[str, Any],
+                                    characteristics: Dict[str, Any],
+                                    num_results: int) -> Tuple[Dict[str, Any], bool]:
+        """
+        Search, rank, analyze and enrich lookalike companies for the given characteristics
+        
+        Args:
+            target_company: Dictionary containing target company data
+            characteristics: Company characteristics for matching
+            num_results: Number of similar companies to return
+            
+        Returns:
+            Tuple of a dictionary with enriched companies, similarity analysis and
+            result counts, and whether every configured search API succeeded
+        """
+        # Without any search API there is nothing to dispatch, rank or enrich
+        if not (self.exa_api_key or self.tavily_api_key):
+            logger.debug("No search API keys available, skipping lookalike search")
+            return {
+                "lookalike_companies": [],
+                "similarity_analysis": self._analyze_similarity_patterns(target_company, []),
+                "counts": {
+                    "exa_results_count": 0,
+                    "tavily_results_count": 0,
+                    "total_candidates": 0
+                }
+            }, True
+        
+        # Search for similar companies using both APIs concurrently
+        search_executor = _get_search_executor()
+        exa_future = search_executor.submit(self._search_with_exa, characteristics, num_results // 2)
+        tavily_future = search_executor.submit(self._search_with_tavily, characteristics, num_results // 2)
+        exa_results, tavily_results = exa_future.result(), tavily_future.result()
+        searches_ok = exa_results is not None and tavily_results is not None
+        exa_results = exa_results or []
+        tavily_results = tavily_results or []
+        
+        # Combine and rank results
+        combined_results = self._combine_and_rank_results(
+            exa_results, tavily_results, characteristics
+        )
+        
+        # Analyze similarity patterns
+        similarity_analysis = self._analyze_similarity_patterns(
+            target_company, combined_results
+        )
+        
+        # Enrich companies with financial data
+        top_results = combined_results[:num_results]
+        logger.info("Enriching %d companies with financial data", len(top_results))
+        enriched_companies = self.financial_service.enrich_companies_with_financial_data(top_results)
+        
+        return {
+            "lookalike_companies": enriched_companies,
+            "similarity_analysis": similarity_analysis,
+            "counts": {
+                "exa_results_count": len(exa_results),
+                "tavily_results_count": len(tavily_results),
+                "total_candidates": len(combined_results)
+            }
+        }, searches_ok
+    
+    def _get_cache_key(self, characteristics: Dict[str, Any], num_results: int) -> tuple:
+        """Build a hashable cache key from search characteristics"""
+        return (num_results,) + tuple(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in sorted(characteristics.items())
+        )
+    
     def _extract_company_characteristics(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract key characteristics from company data for similarity matching
@@ -141,7 +300,7 @@ class LookalikeService:
             "company_size": self._categorize_company_size(financial_data, company_info)
         }
     
-    def _search_with_exa(self, characteristics: Dict[str, Any], num_results: int) -> List[Dict[str, Any]]:
+    def _search_with_exa(self, characteristics: Dict[str, Any], num_results: int) -> Optional[List[Dict[str, Any]]]:
         """
         Search for similar companies using Exa API
         
@@ -150,10 +309,11 @@ class LookalikeService:
             num_results: Number of results to return
             
         Returns:
-            List of similar companies from Exa
+            List of similar companies from Exa (empty when no API key is
+            configured), or None if the search failed
         """
         if not self.exa_api_key:
-            logger.warning("Exa API key not available, skipping Exa search")
+            logger.debug("Exa API key not available, skipping Exa search")
             return []
         
         try:
@@ -181,16 +341,16 @@ class LookalikeService:
             
             if response.status_code == 200:
                 results = response.json().get('results', [])
-                return self._process_exa_results(results, characteristics)
+                return self._process_search_results(results, characteristics, 'exa', 'text', 'publishedDate')
             else:
-                logger.error(f"Exa API error: {response.status_code} - {response.text}")
-                return []
+                logger.error("Exa API error: %s - %s", response.status_code, response.text)
+                return None
                 
-        except Exception as e:
-            logger.error(f"Error searching with Exa: {str(e)}")
-            return []
+        except Exception:
+            logger.exception("Error searching with Exa")
+            return None
     
-    def _search_with_tavily(self, characteristics: Dict[str, Any], num_results: int) -> List[Dict[str, Any]]:
+    def _search_with_tavily(self, characteristics: Dict[str, Any], num_results: int) -> Optional[List[Dict[str, Any]]]:
         """
         Search for similar companies using Tavily API
         
@@ -199,10 +359,11 @@ class LookalikeService:
             num_results: Number of results to return
             
         Returns:
-            List of similar companies from Tavily
+            List of similar companies from Tavily (empty when no API key is
+            configured), or None if the search failed
         """
         if not self.tavily_api_key:
-            logger.warning("Tavily API key not available, skipping Tavily search")
+            logger.debug("Tavily API key not available, skipping Tavily search")
             return []
         
         try:
@@ -222,14 +383,14 @@ class LookalikeService:
             
             if response.status_code == 200:
                 results = response.json().get('results', [])
-                return self._process_tavily_results(results, characteristics)
+                return self._process_search_results(results, characteristics, 'tavily', 'content', 'published_date')
             else:
-                logger.error(f"Tavily API error: {response.status_code} - {response.text}")
-                return []
+                logger.error("Tavily API error: %s - %s", response.status_code, response.text)
+                return None
                 
-        except Exception as e:
-            logger.error(f"Error searching with Tavily: {str(e)}")
-            return []
+        except Exception:
+            logger.exception("Error searching with Tavily")
+            return None
     
     def _build_exa_search_query(self, characteristics: Dict[str, Any]) -> str:
         """Build optimized search query for Exa API"""
@@ -249,7 +410,7 @@ class LookalikeService:
         if business_model:
             query_parts.append(business_model)
         
-        if revenue_scale in ['large', 'enterprise']:
+        if revenue_scale in LARGE_REVENUE_SCALES:
             query_parts.append("billion revenue")
         elif revenue_scale == 'medium':
             query_parts.append("million revenue")
@@ -279,46 +440,38 @@ class LookalikeService:
         
         return " ".join(query_parts)
     
-    def _process_exa_results(self, results: List[Dict], characteristics: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Process and score Exa search results"""
-        processed = []
-        
-        for result in results:
-            company_name = self._extract_company_name_from_result(result)
-            if company_name:
-                similarity_score = self._calculate_similarity_score(result, characteristics)
-                
-                processed.append({
-                    "name": company_name,
-                    "url": result.get('url', ''),
-                    "title": result.get('title', ''),
-                    "snippet": result.get('text', '')[:200] + "...",
-                    "similarity_score": similarity_score,
-                    "source": "exa",
-                    "published_date": result.get('publishedDate', ''),
-                    "domain": result.get('url', '').split('/')[2] if result.get('url') else ''
-                })
+    def _process_search_results(self, results: List[Dict], characteristics: Dict[str, Any],
+                                source: str, text_field: str, date_field: str) -> List[Dict[str, Any]]:
+        """
+        Process and score search results from either search API
         
-        return sorted(processed, key=lambda x: x['similarity_score'], reverse=True)
-    
-    def _process_tavily_results(self, results: List[Dict], characteristics: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Process and score Tavily search results"""
+        Args:
+            results: Raw results returned by the API
+            characteristics: Company characteristics for matching
+            source: Name of the API the results came from
+            text_field: Result field holding the page text
+            date_field: Result field holding the published date
+            
+        Returns:
+            Processed results sorted by similarity score
+        """
         processed = []
         
         for result in results:
             company_name = self._extract_company_name_from_result(result)
             if company_name:
                 similarity_score = self._calculate_similarity_score(result, characteristics)
+                url = result.get('url', '')
                 
                 processed.append({
                     "name": company_name,
-                    "url": result.get('url', ''),
+                    "url": url,
                     "title": result.get('title', ''),
-                    "snippet": result.get('content', '')[:200] + "...",
+                    "snippet": result.get(text_field, '')[:200] + "...",
                     "similarity_score": similarity_score,
-                    "source": "tavily",
-                    "published_date": result.get('published_date', ''),
-                    "domain": result.get('url', '').split('/')[2] if result.get('url') else ''
+                    "source": source,
+                    "published_date": result.get(date_field, ''),
+                    "domain": url.split('/')[2] if url else ''
                 })
         
         return sorted(processed, key=lambda x: x['similarity_score'], reverse=True)
@@ -354,10 +507,9 @@ class LookalikeService:
         if industry and industry in text:
             score += 0.3
         
-        # Technology keywords match
-        tech_keywords = characteristics.get('tech_keywords', [])
-        for keyword in tech_keywords:
-            if keyword.lower() in text:
+        # Technology keywords match (already lowercase from _extract_tech_keywords)
+        for keyword in characteristics.get('tech_keywords', []):
+            if keyword in text:
                 score += 0.1
         
         # Business model match
@@ -378,8 +530,9 @@ class LookalikeService:
             score += 0.1
         
         # Domain authority bonus
-        domain = result.get('url', '').split('/')[2] if result.get('url') else ''
-        if domain in ['crunchbase.com', 'linkedin.com', 'bloomberg.com', 'forbes.com']:
+        url = result.get('url', '')
+        domain = url.split('/')[2] if url else ''
+        if domain in AUTHORITATIVE_DOMAINS:
             score += 0.15
         
         return min(score, 1.0)  # Cap at 1.0
@@ -479,11 +632,11 @@ class LookalikeService:
     
     def _determine_growth_stage(self, hiring_status: str, expansion_plans: str, revenue_scale: str) -> str:
         """Determine company growth stage"""
-        if 'actively hiring' in hiring_status and expansion_plans in ['yes', 'true', 'expanding']:
+        if 'actively hiring' in hiring_status and expansion_plans in EXPANDING_VALUES:
             return 'high-growth'
         elif 'hiring' in hiring_status:
             return 'growing'
-        elif revenue_scale in ['large', 'enterprise']:
+        elif revenue_scale in LARGE_REVENUE_SCALES:
             return 'mature'
         else:
             return 'stable'
@@ -525,11 +678,4 @@ class LookalikeService:
         
         # Fallback to revenue
         revenue_scale = self._categorize_revenue_scale(revenue)
-        if revenue_scale == 'enterprise':
-            return 'enterprise'
-        elif revenue_scale == 'large':
-            return 'large'
-        elif revenue_scale == 'medium':
-            return 'medium'
-        else:
-            return 'small'
+        return REVENUE_SCALE_TO_COMPANY_SIZE.get(revenue_scale, 'small')
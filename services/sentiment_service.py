@@ -6,11 +6,60 @@ Uses GenAI to analyze news sentiment and extract insights
 
 import logging
 import requests
+from collections import Counter
 from typing import List, Dict, Any, Optional
 import json
 
 logger = logging.getLogger(__name__)
 
+# Enhanced sentiment keywords with weights
+STRONG_POSITIVE_KEYWORDS = {
+    'record': 1.0, 'breakthrough': 1.0, 'exceptional': 1.0, 'outstanding': 1.0,
+    'surge': 0.9, 'soar': 0.9, 'boom': 0.9, 'stellar': 0.9, 'robust': 0.8,
+    'accelerate': 0.8, 'momentum': 0.7, 'optimize': 0.7, 'milestone': 0.8
+}
+
+POSITIVE_KEYWORDS = {
+    'growth': 0.7, 'profit': 0.6, 'revenue': 0.5, 'earnings': 0.6, 'success': 0.7,
+    'strong': 0.6, 'increase': 0.5, 'gain': 0.6, 'beat': 0.7, 'exceed': 0.7,
+    'expansion': 0.6, 'innovation': 0.6, 'achievement': 0.6, 'improve': 0.5,
+    'upgrade': 0.6, 'bullish': 0.8, 'outperform': 0.7, 'upside': 0.6
+}
+
+STRONG_NEGATIVE_KEYWORDS = {
+    'crisis': -1.0, 'collapse': -1.0, 'plummet': -1.0, 'crash': -1.0,
+    'devastating': -0.9, 'alarming': -0.9, 'catastrophic': -0.9, 'severe': -0.8,
+    'massive layoffs': -0.9, 'bankruptcy': -1.0, 'scandal': -0.8
+}
+
+NEGATIVE_KEYWORDS = {
+    'loss': -0.6, 'decline': -0.6, 'fall': -0.5, 'drop': -0.5, 'weak': -0.6,
+    'concern': -0.5, 'risk': -0.5, 'threat': -0.6, 'challenge': -0.4,
+    'layoff': -0.7, 'cut': -0.5, 'reduce': -0.4, 'struggle': -0.6,
+    'warning': -0.6, 'bearish': -0.8, 'underperform': -0.7, 'downside': -0.6,
+    'volatility': -0.4, 'uncertainty': -0.5, 'pressure': -0.4
+}
+
+# Market-specific context modifiers
+MARKET_CONTEXT_KEYWORDS = {
+    'q1': 0.1, 'q2': 0.1, 'q3': 0.1, 'q4': 0.1,  # Quarterly context
+    'annual': 0.1, 'fiscal': 0.1, 'guidance': 0.2,
+    'analyst': 0.2, 'forecast': 0.1, 'outlook': 0.2,
+    'sec filing': 0.3, 'earnings call': 0.2, 'investor': 0.2
+}
+
+# Weighted phrases flattened once in scoring order, with their display label
+SENTIMENT_PHRASES = tuple(
+    (phrase, weight, f"{prefix}{phrase}")
+    for prefix, keywords in (
+        ('+', STRONG_POSITIVE_KEYWORDS),
+        ('+', POSITIVE_KEYWORDS),
+        ('-', STRONG_NEGATIVE_KEYWORDS),
+        ('-', NEGATIVE_KEYWORDS)
+    )
+    for phrase, weight in keywords.items()
+)
+
 class SentimentService:
     """Service for analyzing sentiment of company news and sources"""
     
@@ -75,7 +124,7 @@ class SentimentService:
             }
             
         except Exception as e:
-            logger.error(f"Error analyzing sources sentiment: {str(e)}")
+            logger.exception("Error analyzing sources sentiment")
             return {
                 "overall_sentiment": "neutral",
                 "sentiment_score": 0.0,
@@ -139,73 +188,20 @@ class SentimentService:
         """
         text_lower = text.lower()
         
-        # Enhanced sentiment keywords with weights
-        strong_positive = {
-            'record': 1.0, 'breakthrough': 1.0, 'exceptional': 1.0, 'outstanding': 1.0,
-            'surge': 0.9, 'soar': 0.9, 'boom': 0.9, 'stellar': 0.9, 'robust': 0.8,
-            'accelerate': 0.8, 'momentum': 0.7, 'optimize': 0.7, 'milestone': 0.8
-        }
-        
-        positive = {
-            'growth': 0.7, 'profit': 0.6, 'revenue': 0.5, 'earnings': 0.6, 'success': 0.7,
-            'strong': 0.6, 'increase': 0.5, 'gain': 0.6, 'beat': 0.7, 'exceed': 0.7,
-            'expansion': 0.6, 'innovation': 0.6, 'achievement': 0.6, 'improve': 0.5,
-            'upgrade': 0.6, 'bullish': 0.8, 'outperform': 0.7, 'upside': 0.6
-        }
-        
-        strong_negative = {
-            'crisis': -1.0, 'collapse': -1.0, 'plummet': -1.0, 'crash': -1.0,
-            'devastating': -0.9, 'alarming': -0.9, 'catastrophic': -0.9, 'severe': -0.8,
-            'massive layoffs': -0.9, 'bankruptcy': -1.0, 'scandal': -0.8
-        }
-        
-        negative = {
-            'loss': -0.6, 'decline': -0.6, 'fall': -0.5, 'drop': -0.5, 'weak': -0.6,
-            'concern': -0.5, 'risk': -0.5, 'threat': -0.6, 'challenge': -0.4,
-            'layoff': -0.7, 'cut': -0.5, 'reduce': -0.4, 'struggle': -0.6,
-            'warning': -0.6, 'bearish': -0.8, 'underperform': -0.7, 'downside': -0.6,
-            'volatility': -0.4, 'uncertainty': -0.5, 'pressure': -0.4
-        }
-        
-        # Market-specific context modifiers
-        market_context = {
-            'q1': 0.1, 'q2': 0.1, 'q3': 0.1, 'q4': 0.1,  # Quarterly context
-            'annual': 0.1, 'fiscal': 0.1, 'guidance': 0.2,
-            'analyst': 0.2, 'forecast': 0.1, 'outlook': 0.2,
-            'sec filing': 0.3, 'earnings call': 0.2, 'investor': 0.2
-        }
-        
         # Calculate weighted sentiment score
         score = 0.0
         found_phrases = []
         context_boost = 0.0
         
-        # Check strong positive
-        for phrase, weight in strong_positive.items():
-            if phrase in text_lower:
-                score += weight
-                found_phrases.append(f"+{phrase}")
-        
-        # Check positive
-        for phrase, weight in positive.items():
+        # Check strong positive, positive, strong negative and negative phrases
+        # (negative weights are already negative)
+        for phrase, weight, label in SENTIMENT_PHRASES:
             if phrase in text_lower:
                 score += weight
-                found_phrases.append(f"+{phrase}")
-        
-        # Check strong negative
-        for phrase, weight in strong_negative.items():
-            if phrase in text_lower:
-                score += weight  # weight is already negative
-                found_phrases.append(f"-{phrase}")
-        
-        # Check negative
-        for phrase, weight in negative.items():
-            if phrase in text_lower:
-                score += weight  # weight is already negative
-                found_phrases.append(f"-{phrase}")
+                found_phrases.append(label)
         
         # Apply market context boost
-        for phrase, boost in market_context.items():
+        for phrase, boost in MARKET_CONTEXT_KEYWORDS.items():
             if phrase in text_lower:
                 context_boost += boost
         
@@ -390,8 +386,8 @@ class SentimentService:
                 }
             }
             
-        except Exception as e:
-            logger.error(f"Error calculating growth score: {str(e)}")
+        except Exception:
+            logger.exception("Error calculating growth score")
             return {
                 "growth_score": 0.0,
                 "display_score": 50,
@@ -517,20 +513,28 @@ class SentimentService:
         if not source_sentiments:
             return "Insufficient source material available for comprehensive sentiment analysis."
         
-        # Enhanced sentiment categorization
-        very_positive_count = sum(1 for s in source_sentiments if s["sentiment"] == "very positive")
-        positive_count = sum(1 for s in source_sentiments if s["sentiment"] == "positive")
-        neutral_count = sum(1 for s in source_sentiments if s["sentiment"] == "neutral")
-        negative_count = sum(1 for s in source_sentiments if s["sentiment"] == "negative")
-        very_negative_count = sum(1 for s in source_sentiments if s["sentiment"] == "very negative")
+        # Enhanced sentiment categorization and confidence metrics in a single pass
+        sentiment_counts = Counter()
+        total_confidence = 0.0
+        high_confidence_sources = 0
+        for source_sentiment in source_sentiments:
+            sentiment_counts[source_sentiment["sentiment"]] += 1
+            confidence = source_sentiment["confidence"]
+            total_confidence += confidence
+            if confidence > 0.7:
+                high_confidence_sources += 1
+        
+        very_positive_count = sentiment_counts["very positive"]
+        positive_count = sentiment_counts["positive"]
+        neutral_count = sentiment_counts["neutral"]
+        negative_count = sentiment_counts["negative"]
+        very_negative_count = sentiment_counts["very negative"]
         
         total_sources = len(source_sentiments)
         total_positive = very_positive_count + positive_count
         total_negative = very_negative_count + negative_count
         
-        # Calculate confidence metrics
-        avg_confidence = sum(s["confidence"] for s in source_sentiments) / total_sources
-        high_confidence_sources = sum(1 for s in source_sentiments if s["confidence"] > 0.7)
+        avg_confidence = total_confidence / total_sources
         
         summary_parts = []
         
@@ -602,9 +606,9 @@ class SentimentService:
             if response.status_code == 200:
                 return response.text
             else:
-                logger.warning(f"Failed to fetch {url}: HTTP {response.status_code}")
+                logger.warning("Failed to fetch %s: HTTP %s", url, response.status_code)
                 return None
                 
         except Exception as e:
-            logger.warning(f"Error fetching URL {url}: {str(e)}")
+            logger.warning("Error fetching URL %s: %s", url, e)
             return None